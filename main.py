@@ -2,18 +2,42 @@
 Professional, modular CLI for YT-DLP video downloading with light, readable coloring, configurable parallel downloads, and an always-visible status panel.
 """
 from __future__ import annotations
+import atexit
+import functools
+import hashlib
+import itertools
 import json
 import os
+import queue
 import re
 import shutil
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import unicodedata
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
-from threading import Lock
-from typing import Dict, List, Optional, Tuple
-import yt_dlp
+from threading import Lock, Thread, local
+from operator import attrgetter
+from typing import TYPE_CHECKING, Callable, Dict, List, NamedTuple, Optional, Tuple
+if TYPE_CHECKING:
+    import yt_dlp
+try:
+    import orjson
+except ImportError:
+    orjson = None
+if os.name == 'nt':
+    import msvcrt
+    select = termios = tty = None
+else:
+    msvcrt = None
+    import select
+    try:
+        import termios, tty
+    except ImportError:
+        termios = tty = None
 # ============== UI AND COLOR ==============
 class Palette:
     HEADER   = "\033[38;5;153m"
@@ -29,44 +53,78 @@ class Palette:
     RESET    = "\033[0m"
 # Coloring helpers
 
-def style(text: str, color: str) -> str:
-    return f"{color}{text}{Palette.RESET}" if supports_ansi() else text
+def _enable_windows_vt() -> bool:
+    # legacy Windows consoles print escape codes literally until VT processing is switched on
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.GetStdHandle(-11)
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)): return False
+        return bool(mode.value & 0x0004 or kernel32.SetConsoleMode(handle, mode.value | 0x0004))
+    except Exception:
+        return False
 
-def status_text(val: bool) -> str:
-    return style("ON", Palette.SUCCESS) if val else style("OFF", Palette.WARNING)
+def _detect_ansi() -> bool:
+    if not (hasattr(sys.stdout, "isatty") and sys.stdout.isatty()): return False
+    return os.name != 'nt' or _enable_windows_vt()
 
-def value_text(text: str) -> str:
-    return style(text, Palette.VALUE)
+_ANSI = _detect_ansi()
 
-def accent(text: str) -> str:
-    return style(text, Palette.ACCENT)
+def _style_ansi(text: str, color: str) -> str:
+    return f"{color}{text}\x1b[0m"
 
-def header(text: str) -> None:
-    print(style(text, Palette.HEADER + Palette.BOLD))
+def _plain(text: str, color: str = "") -> str:
+    # identity painter; the optional color lets it stand in for style() as well
+    return text
 
-def code_text(text: str) -> str:
-    return style(text, Palette.CODE)
+def _painter(color: str) -> Callable[[str], str]:
+    if not _ANSI: return _plain
+    def paint(text: str) -> str:
+        return f"{color}{text}\x1b[0m"
+    return paint
 
-def info_text(text: str) -> str:
-    return style(text, Palette.INFO)
+_HEADER_BOLD = Palette.HEADER + Palette.BOLD
+_PROMPT_BOLD = Palette.ACCENT + Palette.BOLD
 
-def warning_text(text: str) -> str:
-    return style(text, Palette.WARNING)
+# ANSI support is decided once at import; the helpers are bound to match
+style = _style_ansi if _ANSI else _plain
+value_text = _painter(Palette.VALUE)
+accent = _painter(Palette.ACCENT)
+code_text = _painter(Palette.CODE)
+info_text = _painter(Palette.INFO)
+warning_text = _painter(Palette.WARNING)
+error_text = _painter(Palette.ERROR)
+success_text = _painter(Palette.SUCCESS)
+header_text = _painter(_HEADER_BOLD)
+prompt_text = _painter(_PROMPT_BOLD)
+_STATUS_ON, _STATUS_OFF = success_text("ON"), warning_text("OFF")
 
-def error_text(text: str) -> str:
-    return style(text, Palette.ERROR)
+def status_text(val: bool) -> str:
+    return _STATUS_ON if val else _STATUS_OFF
+
+def header(text: str) -> None:
+    print(header_text(text))
+
+CLEAR = b"\x1b[H\x1b[2J\x1b[3J"
 
 def clear_console() -> None:
-    os.system('cls' if os.name == 'nt' else 'clear')
+    sys.stdout.flush()
+    if not _write_control(CLEAR):
+        os.system('cls' if os.name == 'nt' else 'clear')
 
 def prompt(text: str) -> str:
-    return style(f"{text}: ", Palette.ACCENT + Palette.BOLD)
+    return prompt_text(f"{text}: ")
 
 def supports_ansi() -> bool:
-    return hasattr(sys.stdout, "isatty") and sys.stdout.isatty()
+    return _ANSI
 
-def strip_ansi(text: str) -> str:
-    return re.sub(r'\x1b\[[0-9;]*[A-Za-z]', '', text)
+_ANSI_RE = re.compile(r'\x1b\[[0-9;]*[A-Za-z]')
+
+@functools.lru_cache(maxsize=512)
+def visible_len(text: str) -> int:
+    if "\x1b" not in text: return len(text)
+    return len(text) - sum(len(m) for m in _ANSI_RE.findall(text))
 # ============= CURSOR/MENU RENDERING =============
 _CURSOR_HIDE_DEPTH = 0
 
@@ -89,49 +147,85 @@ def pop_hidden_cursor(force: bool = False) -> None:
 def is_cursor_hidden() -> bool:
     return _CURSOR_HIDE_DEPTH > 0
 
+def _write_control(seq: bytes) -> bool:
+    if not _ANSI: return False
+    try:
+        os.write(sys.stdout.fileno(), seq)
+        return True
+    except (OSError, ValueError):
+        return False
+
 def hide_cursor() -> bool:
-    if supports_ansi():
-        try:
-            sys.stdout.write("\x1b[?25l")
-            sys.stdout.flush()
-            return True
-        except Exception:
-            pass
-    return False
+    return _write_control(b"\x1b[?25l")
 
 def show_cursor() -> bool:
-    if supports_ansi():
-        try:
-            sys.stdout.write("\x1b[?25h")
-            sys.stdout.flush()
-            return True
-        except Exception:
-            pass
-    return False
+    return _write_control(b"\x1b[?25h")
+def write_frame(data: bytes) -> None:
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(bytes(data).decode("utf-8")); sys.stdout.flush(); return
+    sys.stdout.flush()
+    out.write(data)
+    out.flush()
 class MenuScreen:
     def __init__(self):
         self._display_lines = 0
         self._initial = True
         self._supports_cursor = supports_ansi()
         self._cursor_managed = False
+        self._buf = bytearray()
+        self._measure_key: Optional[Tuple[Tuple[str, ...], int]] = None
+        self._measure_total = 0
+        self._row_heights: List[int] = []
+        self._row_offsets: List[int] = []
     def __enter__(self):
         self._ensure_cursor_hidden()
+        enter_key_mode()
         return self
     def __exit__(self, exc_type, exc, tb):
         self.close()
     def render(self, lines: List[str]):
         self._ensure_cursor_hidden()
+        previous = self._measure_key
         shown = self._measure_display_lines(lines)
-        if self._initial:
-            clear_console()
-            self._initial = False
-        elif self._supports_cursor and self._display_lines:
-            sys.stdout.write(f"\x1b[{self._display_lines}F\x1b[J")
+        if not self._initial and previous is not None and previous is self._measure_key: return
+        buf = self._buf
+        buf.clear()
+        if not self._initial and self._supports_cursor and self._display_lines:
+            buf += b"\x1b[%dF\x1b[J" % self._display_lines
+        elif _ANSI:
+            buf += CLEAR
         else:
             clear_console()
-        print("\n".join(lines))
+        self._initial = False
+        buf += "\n".join(lines).encode("utf-8")
+        buf += b"\n"
+        write_frame(buf)
         self._display_lines = shown
+    def render_marker_change(self, old: int, new: int, lines: List[str]):
+        # Only lines[old] and lines[new] may differ from the previous frame; both are
+        # rewritten in place. Anything else (first frame, resize, wrapping rows, a frame
+        # taller than the terminal, where ESC[nF stops at the top row) repaints.
+        previous = self._measure_key
+        if self._initial or not self._supports_cursor or previous is None or len(previous[0]) != len(lines):
+            self.render(lines); return
+        if self._display_lines >= self._terminal_height():
+            self.render(lines); return
+        width = previous[1]
+        if self._terminal_width() != width or any(self._row_heights[i] != 1 or self._line_rows(lines[i], width) != 1 for i in (old, new)):
+            self.render(lines); return
+        self._ensure_cursor_hidden()
+        buf = self._buf
+        buf.clear()
+        for i in (old, new):
+            up = self._display_lines - self._row_offsets[i]
+            buf += b"\x1b[%dF\x1b[2K" % up
+            buf += lines[i].encode("utf-8")
+            buf += b"\x1b[%dE" % up
+        write_frame(buf)
+        self._measure_key = (tuple(lines), width)
     def reset(self):
+        leave_key_mode()
         self._display_lines = 0
         self._initial = True
     def close(self):
@@ -141,20 +235,48 @@ class MenuScreen:
     def _ensure_cursor_hidden(self):
         if not self._cursor_managed: push_hidden_cursor(); self._cursor_managed = True
         elif not is_cursor_hidden(): push_hidden_cursor()
-    def _measure_display_lines(self, lines: List[str]) -> int:
+    @staticmethod
+    def _terminal_width() -> int:
         try:
             width = shutil.get_terminal_size(fallback=(80,24)).columns
         except Exception:
             width = 80
+        return max(1, width)
+    @staticmethod
+    def _terminal_height() -> int:
+        try:
+            return shutil.get_terminal_size(fallback=(80,24)).lines
+        except Exception:
+            return 24
+    @staticmethod
+    def _line_rows(entry: str, width: int) -> int:
+        n = visible_len(entry)
+        return max(1, (n + width - 1) // width) if n else 1
+    def _measure_display_lines(self, lines: List[str]) -> int:
+        width = self._terminal_width()
+        key = (tuple(lines), width)
+        if key == self._measure_key: return self._measure_total
+        heights = [self._line_rows(entry, width) for entry in lines]
+        offsets = []
         total = 0
-        width = max(1, width)
-        for entry in lines:
-            plain = strip_ansi(entry)
-            total += max(1, (len(plain) + width - 1) // width) if plain else 1
+        for rows in heights:
+            offsets.append(total)
+            total += rows
+        self._measure_key = key
+        self._measure_total = total
+        self._row_heights = heights
+        self._row_offsets = offsets
         return total
 # ============= SETTINGS AND STATUS =============
 SETTINGS_PATH = Path(__file__).resolve().parent / "settings.json"
 
+def dump_json(payload: Dict[str, object]) -> bytes:
+    if orjson is not None: return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
+
+def load_json(data: bytes) -> object:
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
 @dataclass
 class RuntimeSettings:
     OutputFolder: Path = Path("downloads")
@@ -162,212 +284,547 @@ class RuntimeSettings:
     ParallelDownloads: int = 4
     RetryAttempts: int = 2
     ChunkSizeKiB: int = 512
+    ConcurrentFragments: int = 4
     ShowStatusPanel: bool = True
     SettingsPath: Path = field(default=SETTINGS_PATH, init=False, repr=False)
+    _last_hash: Optional[bytes] = field(default=None, init=False, repr=False, compare=False)
+    _dir_ready: bool = field(default=False, init=False, repr=False, compare=False)
     def __post_init__(self): self.refresh_paths()
-    def refresh_paths(self): self.OutputFolder = self.OutputFolder.expanduser()
+    def refresh_paths(self):
+        # expanduser only ever rewrites a leading "~"
+        if str(self.OutputFolder).startswith("~"): self.OutputFolder = self.OutputFolder.expanduser()
     def to_payload(self) -> Dict[str, object]:
-        return {"OutputFolder": str(self.OutputFolder), "OverwriteExisting": self.OverwriteExisting, "ParallelDownloads": self.ParallelDownloads, "RetryAttempts": self.RetryAttempts, "ChunkSizeKiB": self.ChunkSizeKiB, "ShowStatusPanel": self.ShowStatusPanel}
+        return {"OutputFolder": str(self.OutputFolder), "OverwriteExisting": self.OverwriteExisting, "ParallelDownloads": self.ParallelDownloads, "RetryAttempts": self.RetryAttempts, "ChunkSizeKiB": self.ChunkSizeKiB, "ConcurrentFragments": self.ConcurrentFragments, "ShowStatusPanel": self.ShowStatusPanel}
     def save(self):
-        self.SettingsPath.parent.mkdir(parents=True, exist_ok=True)
-        with self.SettingsPath.open("w", encoding="utf-8") as h:
-            json.dump(self.to_payload(), h, indent=2)
+        data = dump_json(self.to_payload())
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        if digest == self._last_hash: return
+        if not self._dir_ready:
+            self.SettingsPath.parent.mkdir(parents=True, exist_ok=True); self._dir_ready = True
+        tmp = self.SettingsPath.with_suffix(".json.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, self.SettingsPath)
+        self._last_hash = digest
     @classmethod
     def load(cls) -> "RuntimeSettings":
         instance = cls()
         if not instance.SettingsPath.exists(): return instance
         try:
-            payload = json.loads(instance.SettingsPath.read_text(encoding="utf-8"))
+            raw = instance.SettingsPath.read_bytes()
+            payload = load_json(raw)
         except Exception:
             return instance
         if isinstance(payload, dict):
-            for f in ["OutputFolder", "OverwriteExisting", "ParallelDownloads", "RetryAttempts", "ChunkSizeKiB", "ShowStatusPanel"]:
+            for f in ["OutputFolder", "OverwriteExisting", "ParallelDownloads", "RetryAttempts", "ChunkSizeKiB", "ConcurrentFragments", "ShowStatusPanel"]:
                 v = payload.get(f)
                 if v is not None:
                     setattr(instance, f, v if f != "OutputFolder" else Path(v))
         instance.refresh_paths()
+        instance._last_hash = hashlib.blake2b(raw, digest_size=16).digest()
         return instance
 # ----------- STATUS PANEL -----------
+_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+
 def format_size(sz: int) -> str:
-    units = ["B", "KiB", "MiB", "GiB", "TiB"]
-    val = float(sz)
-    for i, unit in enumerate(units):
-        if val < 1024 or i==len(units)-1:
-            return f"{int(val)} {unit}" if unit=="B" else f"{val:.2f} {unit}"
-        val /= 1024
+    sz = int(sz)
+    if sz < 1024: return f"{sz} B"
+    i = min((sz.bit_length() - 1) // 10, 4)
+    return f"{sz / (1 << (i*10)):.2f} {_UNITS[i]}"
+
+def panel_label(text: str, width: int = 15) -> str:
+    # pad on the visible text so the ANSI codes do not eat the alignment
+    return f" {accent(text)}{' ' * max(0, width - len(text))} "
+
+_PANEL_TITLE = style("YT-DLP CLI STATUS", Palette.HEADER)
+_LBL_OUTPUT = panel_label("Output folder")
+_LBL_OVERWRITE = panel_label("Overwrite")
+_LBL_PARALLEL = panel_label("Parallel")
+_LBL_RETRIES = panel_label("Retries")
+_LBL_CHUNK = panel_label("Chunk (KiB)")
+_LBL_FRAGMENTS = panel_label("Fragments")
+_LBL_STATUS = panel_label("Show Status")
+_panel_cache: Optional[Tuple[tuple, List[str]]] = None
 
 def status_panel(settings: RuntimeSettings) -> List[str]:
-    return [
-        style("YT-DLP CLI STATUS", Palette.HEADER),
-        f" {accent('Output folder').ljust(15)} {info_text(str(settings.OutputFolder))}",
-        f" {accent('Overwrite').ljust(15)} {status_text(settings.OverwriteExisting)}",
-        f" {accent('Parallel').ljust(15)} {value_text(str(settings.ParallelDownloads))}",
-        f" {accent('Retries').ljust(15)} {value_text(str(settings.RetryAttempts))}",
-        f" {accent('Chunk (KiB)').ljust(15)} {value_text(str(settings.ChunkSizeKiB))}",
-        f" {accent('Show Status').ljust(15)} {status_text(settings.ShowStatusPanel)}",
+    global _panel_cache
+    key = (str(settings.OutputFolder), settings.OverwriteExisting, settings.ParallelDownloads, settings.RetryAttempts, settings.ChunkSizeKiB, settings.ConcurrentFragments, settings.ShowStatusPanel)
+    if _panel_cache is not None and _panel_cache[0] == key: return _panel_cache[1]
+    lines = [
+        _PANEL_TITLE,
+        _LBL_OUTPUT + info_text(str(settings.OutputFolder)),
+        _LBL_OVERWRITE + status_text(settings.OverwriteExisting),
+        _LBL_PARALLEL + value_text(str(settings.ParallelDownloads)),
+        _LBL_RETRIES + value_text(str(settings.RetryAttempts)),
+        _LBL_CHUNK + value_text(str(settings.ChunkSizeKiB)),
+        _LBL_FRAGMENTS + value_text(str(settings.ConcurrentFragments)),
+        _LBL_STATUS + status_text(settings.ShowStatusPanel),
         ""
     ] if settings.ShowStatusPanel else []
+    _panel_cache = (key, lines)
+    return lines
+
+def print_status_panel(settings: RuntimeSettings) -> None:
+    lines = status_panel(settings)
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n"); sys.stdout.flush()
 # ============= MENUS =============
-def format_menu_option(label: str, value: str = "", hint: str = "", selected: bool = False) -> str:
-    marker = style("›", Palette.ACCENT) if selected else " "
-    label_styled = style(label, Palette.ACCENT + Palette.BOLD) if selected else label
-    val_col = Palette.SUCCESS if value in ["ON", "on", "ENABLED"] else Palette.WARNING if value in ["OFF", "off", "DISABLED"] else Palette.VALUE
-    parts = [f"{marker} {label_styled}"]
-    if value:
-        parts.append(style(f"{value}", val_col))
-    if hint:
-        parts.append(style(f"({hint})", Palette.WARNING))
-    return " ".join(parts)
+_MARKER_SEL = accent("›")
+_MARKER_UNSEL = " "
+_NAV_HINT = accent("Use ↑/↓ to navigate, Enter to select.")
+_NAV_HINT_CANCEL = accent("Use ↑/↓ to navigate, Enter to select, ESC to cancel.")
+
+class MenuOption(NamedTuple):
+    label: str
+    value: str = ""
+    hint: str = ""
+    action: str = ""
+
+_VAL_COL = {
+    "ON": Palette.SUCCESS, "on": Palette.SUCCESS, "ENABLED": Palette.SUCCESS,
+    "OFF": Palette.WARNING, "off": Palette.WARNING, "DISABLED": Palette.WARNING,
+}
+
+_LABEL_SEL = Palette.ACCENT + Palette.BOLD
+
+@functools.lru_cache(maxsize=256)
+def option_pair(label: str, value: str = "", hint: str = "") -> Tuple[str, str]:
+    # value and hint render the same either way, so the shared tail is built once
+    tail = "".join((
+        " " + style(value, _VAL_COL.get(value, Palette.VALUE)) if value else "",
+        " " + warning_text(f"({hint})") if hint else "",
+    ))
+    return f"{_MARKER_UNSEL} {label}{tail}", f"{_MARKER_SEL} {style(label, _LABEL_SEL)}{tail}"
+
 def supports_keyboard_navigation() -> bool:
-    try:
-        import msvcrt
-        return True
-    except ImportError:
-        try:
-            import tty, termios
-            return sys.stdin.isatty()
-        except ImportError:
-            return False
+    if msvcrt is not None: return True
+    return termios is not None and sys.stdin.isatty()
 
-def read_keypress() -> str:
-    try:
-        import msvcrt
-        while msvcrt.kbhit(): msvcrt.getch()
-        key = msvcrt.getch()
-        if key in (b'\x00', b'\xe0'):
-            k = msvcrt.getch()
-            return "UP" if k==b'H' else "DOWN" if k==b'P' else ""
-        elif key == b'\r': return "ENTER"
-        elif key == b' ': return "SPACE"
-        elif key == b'\x1b': return "ESC"
-    except ImportError:
-        import tty, termios, select
+_WIN_KEYS = {b'\xe0H': "UP", b'\x00H': "UP", b'\xe0P': "DOWN", b'\x00P': "DOWN", b'\r': "ENTER", b' ': "SPACE", b'\x1b': "ESC"}
+_POSIX_KEYS = {b'\x1b[A': "UP", b'\x1b[B': "DOWN", b'\x1bOA': "UP", b'\x1bOB': "DOWN", b'\r': "ENTER", b'\n': "ENTER", b' ': "SPACE", b'\x1b': "ESC"}
+
+def _decode_posix_keys(data: bytes) -> List[str]:
+    keys = []
+    i = 0
+    while i < len(data):
+        step = 3 if data[i:i+1] == b'\x1b' and data[i+1:i+2] in (b'[', b'O') else 1
+        keys.append(_POSIX_KEYS.get(data[i:i+step], ""))
+        i += step
+    return keys
+
+_PENDING_KEYS: List[str] = []
+
+def _collapse_keys(keys: List[str]) -> List[str]:
+    # a run of the same arrow key (key repeat, SSH lag) moves one row; every other key
+    # is kept in order so "DOWN, ENTER" still selects the row it moved to
+    out: List[str] = []
+    for k in keys:
+        if k and not (k in ("UP", "DOWN") and out and out[-1] == k): out.append(k)
+    return out
+
+_KEY_MODE: Optional[list] = None
+
+def enter_key_mode() -> None:
+    # cbreak stays on between keypresses and is dropped by leave_key_mode()
+    # before anything reads a line with input()
+    global _KEY_MODE
+    if _KEY_MODE is None and termios is not None and sys.stdin.isatty():
         fd = sys.stdin.fileno()
-        orig = termios.tcgetattr(fd)
-        try:
-            tty.setraw(fd)
-            ch = sys.stdin.read(1)
-            if ch in {'\r','\n'}: return "ENTER"
-            if ch == '\x1b':
-                ready,_,_ = select.select([sys.stdin],[],[],0.05)
-                if not ready: return "ESC"
-                next = sys.stdin.read(1)
-                if next == '[':
-                    arr = sys.stdin.read(1)
-                    return "UP" if arr=='A' else "DOWN" if arr=='B' else ""
-                return next
-            if ch == ' ': return "SPACE"
-        finally:
-            termios.tcsetattr(fd, termios.TCSADRAIN, orig)
-    return ""
+        _KEY_MODE = termios.tcgetattr(fd)
+        tty.setcbreak(fd)
+
+def leave_key_mode() -> None:
+    global _KEY_MODE
+    _PENDING_KEYS.clear()
+    if _KEY_MODE is not None:
+        termios.tcsetattr(sys.stdin.fileno(), termios.TCSADRAIN, _KEY_MODE)
+        _KEY_MODE = None
+
+def read_keypress(timeout: Optional[float] = None) -> str:
+    # with a timeout, returns "TIMEOUT" when no key arrived in time
+    if _PENDING_KEYS: return _PENDING_KEYS.pop(0)
+    if msvcrt is not None:
+        if timeout is not None:
+            deadline = time.monotonic() + timeout
+            while not msvcrt.kbhit():
+                if time.monotonic() >= deadline: return "TIMEOUT"
+                time.sleep(0.01)
+        keys = []
+        while True:
+            key = msvcrt.getch()
+            if key in (b'\x00', b'\xe0'): key += msvcrt.getch()
+            keys.append(_WIN_KEYS.get(key, ""))
+            if not msvcrt.kbhit(): break
+    else:
+        enter_key_mode()
+        fd = sys.stdin.fileno()
+        if not select.select([fd],[],[],timeout)[0]: return "TIMEOUT"
+        data = os.read(fd, 8)
+        if data == b'\x1b' and select.select([fd],[],[],0.05)[0]:
+            data += os.read(fd, 8)
+        # drain the whole burst so repeated arrows can be collapsed
+        while select.select([fd],[],[],0)[0]:
+            data += os.read(fd, 64)
+        keys = _decode_posix_keys(data)
+    keys = _collapse_keys(keys)
+    if not keys: return ""
+    _PENDING_KEYS.extend(keys[1:])
+    return keys[0]
 # ============= DOWNLOAD AND FORMAT LOGIC =============
-def fetch_formats(url: str) -> Tuple[Optional[dict], Optional[List[dict]], Optional[str]]:
+_INFO_TLS = local()
+# weak, so instances of worker threads that have exited (a rebuilt pool) can be freed
+_OPEN_YDLS: "weakref.WeakSet[yt_dlp.YoutubeDL]" = weakref.WeakSet()
+_OPEN_YDLS_LOCK = Lock()
+
+def _track_ydl(ydl: yt_dlp.YoutubeDL) -> yt_dlp.YoutubeDL:
+    with _OPEN_YDLS_LOCK: _OPEN_YDLS.add(ydl)
+    return ydl
+
+@atexit.register
+def _close_ydls() -> None:
+    # the pool's per-thread instances live for the whole session; flush cookies and close their openers once
+    with _OPEN_YDLS_LOCK: ydls = list(_OPEN_YDLS); _OPEN_YDLS.clear()
+    for ydl in ydls:
+        try: ydl.__exit__(None, None, None)
+        except Exception: pass
+
+def preload_yt_dlp() -> None:
+    # yt_dlp dominates startup, so it is imported in the background while the menu is up
+    def load():
+        try: import yt_dlp  # noqa: F401
+        except ImportError: pass
+    Thread(target=load, daemon=True).start()
+
+def _get_info_ydl() -> yt_dlp.YoutubeDL:
+    # YoutubeDL is not thread-safe, so each thread keeps its own extraction instance
+    ydl = getattr(_INFO_TLS, "ydl", None)
+    if ydl is None:
+        import yt_dlp
+        ydl = _INFO_TLS.ydl = _track_ydl(yt_dlp.YoutubeDL({'quiet':True,'no_warnings':True}))
+    return ydl
+
+class VideoFormat(NamedTuple):
+    format_id: str
+    height: int
+    ext: str
+    filesize: int
+    fps: object
+
+FORMAT_CACHE_TTL = 300.0
+FORMAT_CACHE_SIZE = 32
+_FORMAT_CACHE: "OrderedDict[str, Tuple[dict, List[VideoFormat], float]]" = OrderedDict()
+_FORMAT_CACHE_LOCK = Lock()
+
+_TIME_FRAGMENT = re.compile(r'#t=[0-9hms.:]+$')
+
+def format_cache_key(url: str) -> str:
+    # only a "#t=" start time is dropped; other fragments often carry the video id
+    # (YouTube "#!v=", Dailymotion "/#/video/...") and must stay part of the key
+    return _TIME_FRAGMENT.sub('', url)
+
+def _cached_formats(url: str) -> Optional[Tuple[dict, List[VideoFormat]]]:
+    key = format_cache_key(url)
+    with _FORMAT_CACHE_LOCK:
+        entry = _FORMAT_CACHE.get(key)
+        if entry is None: return None
+        if time.monotonic() - entry[2] >= FORMAT_CACHE_TTL:
+            del _FORMAT_CACHE[key]; return None
+        _FORMAT_CACHE.move_to_end(key)
+        return entry[0], list(entry[1])
+
+def _store_formats(url: str, info: dict, formats: List[VideoFormat]) -> None:
+    key = format_cache_key(url)
+    with _FORMAT_CACHE_LOCK:
+        _FORMAT_CACHE[key] = (info, list(formats), time.monotonic())
+        _FORMAT_CACHE.move_to_end(key)
+        while len(_FORMAT_CACHE) > FORMAT_CACHE_SIZE: _FORMAT_CACHE.popitem(last=False)
+
+def fetch_formats(url: str) -> Tuple[Optional[dict], Optional[List[VideoFormat]], Optional[str]]:
+    cached = _cached_formats(url)
+    if cached is not None: return cached[0], cached[1], None
     try:
-        with yt_dlp.YoutubeDL({'quiet':True,'no_warnings':True}) as ydl:
-            info = ydl.extract_info(url, download=False)
-            formats = [
-                {
-                    'format_id': f.get('format_id'),
-                    'height': f.get('height', 0),
-                    'ext': f.get('ext', 'N/A'),
-                    'filesize': f.get('filesize', 0),
-                    'fps': f.get('fps', 'N/A')
-                }
-                for f in info.get('formats', []) if f.get('vcodec') != 'none' and f.get('acodec') != 'none']
-            return info, formats, None
+        info = _get_info_ydl().extract_info(url, download=False)
+        formats = [
+            VideoFormat(get('format_id'), get('height') or 0, get('ext') or 'N/A', get('filesize') or 0, get('fps') or 'N/A')
+            for get in (f.get for f in info.get('formats', ()))
+            if get('vcodec') != 'none' and get('acodec') != 'none']
+        _store_formats(url, info, formats)
+        return info, formats, None
     except Exception as e:
         return None, None, str(e)
 
-def download_job(url:str, format_id:str, out_path:Path, progress:ProgressDisplay, tries:int=1) -> Tuple[bool, Optional[str]]:
+_DOWNLOAD_TLS = local()
+
+class _HookRelay:
+    # registered once per YoutubeDL and retargeted per job; yt-dlp also calls progress
+    # hooks from its fragment threads, so the current hook cannot live in a thread-local
+    __slots__ = ("hook",)
+    def __init__(self): self.hook: Optional[Callable[[dict], None]] = None
+    def __call__(self, d: dict) -> None:
+        hook = self.hook
+        if hook is not None: hook(d)
+
+def _get_download_ydl(format_id: str, outtmpl: str, chunk_size: int, fragments: int, hook: Callable[[dict], None]) -> yt_dlp.YoutubeDL:
+    ydl = getattr(_DOWNLOAD_TLS, "ydl", None)
+    if ydl is None:
+        import yt_dlp
+        relay = _DOWNLOAD_TLS.relay = _HookRelay()
+        ydl = _DOWNLOAD_TLS.ydl = _track_ydl(yt_dlp.YoutubeDL({'format':format_id,'outtmpl':outtmpl,'progress_hooks':[relay],'quiet':True}))
+    elif ydl.params.get('format') != format_id:
+        ydl.params['format'] = format_id
+        ydl.format_selector = ydl.build_format_selector(format_id)
+    ydl.params['outtmpl']['default'] = outtmpl
+    # read per download by yt-dlp, so a changed setting applies to the next job.
+    # http_chunk_size stays unset: range-chunking costs a round trip per chunk
+    ydl.params['buffersize'] = chunk_size
+    # DASH/HLS formats are fragmented; fetch that many fragments at once
+    ydl.params['concurrent_fragment_downloads'] = fragments
+    _DOWNLOAD_TLS.relay.hook = hook
+    return ydl
+
+def download_job(url:str, format_id:str, out_path:Path, progress:ProgressDisplay, retries:int=0, chunk_kib:int=512, fragments:int=1) -> Tuple[bool, Optional[str]]:
+    names: Dict[str, str] = {}
+    slot = progress.track()
+    def progress_hook(d):
+        status = d['status']
+        if status != 'downloading' and status != 'finished': return
+        get = d.get
+        path = get('filename', 'video')
+        filename = names.get(path)
+        if filename is None: filename = names[path] = os.path.basename(path)
+        if status == 'downloading':
+            progress.update(slot, filename, get('_percent_str', 'N/A').strip(), get('_speed_str', 'N/A').strip())
+        else:
+            progress.complete(slot, filename, True)
+    try:
+        ydl = _get_download_ydl(format_id, str(out_path/'%(title)s.%(ext)s'), chunk_kib * 1024, fragments, progress_hook)
+    except Exception as exc:
+        return False, str(exc)
     last_exception = None
-    for attempt in range(1,tries+1):
+    # only the download itself is retried; the first attempt is not a retry
+    for _ in range(retries + 1):
         try:
-            def progress_hook(d):
-                if d['status']=='downloading':
-                    filename = Path(d.get('filename','video')).name
-                    percent = d.get('_percent_str', 'N/A').strip()
-                    speed = d.get('_speed_str', 'N/A').strip()
-                    progress.update(filename, percent, speed)
-                elif d['status']=='finished':
-                    filename = Path(d.get('filename','video')).name
-                    progress.complete(filename, True)
-            opts = {'format':format_id,'outtmpl':str(out_path/'%(title)s.%(ext)s'),'progress_hooks':[progress_hook],'quiet':True}
-            with yt_dlp.YoutubeDL(opts) as ydl: ydl.download([url])
+            ydl.download([url])
             return True, None
         except Exception as exc:
             last_exception = exc
+    # the last attempt died mid-file: close its row under the name the hook last showed
+    state = slot[0]
+    if state is not None: progress.complete(slot, state[0], False)
     return False,str(last_exception)
 
 class ProgressDisplay:
-    def __init__(self):
+    _STOP = object()
+    _TAG = f"\n{info_text('[Download]')} ".encode()
+    _CODE, _VAL, _RESET = (Palette.CODE.encode(), Palette.VALUE.encode(), b"\x1b[0m") if _ANSI else (b"", b"", b"")
+    _PROGRESS = b"\rProgress: " + _VAL
+    _SPEED = _RESET + b" | Speed: " + _VAL
+    MIN_INTERVAL, MAX_INTERVAL = 0.1, 0.5
+    def __init__(self, interval: float = 0.5, block: bool = False):
         self._current_file = ''
-        self._lock = Lock()
-        self._last_update = 0.0
-    def update(self, filename:str, percent:str, speed:str):
-        now = time.time()
-        if now-self._last_update<0.5: return
-        self._last_update = now
-        with self._lock:
-            if filename != self._current_file:
-                self._current_file = filename
-                print(f"\n{style('[Download]',Palette.INFO)} {code_text(filename)}")
-            print(f"\rProgress: {value_text(percent)} | Speed: {value_text(speed)}", end='', flush=True)
-    def complete(self, filename:str,success:bool):
-        with self._lock:
-            status = style('✓ Done', Palette.SUCCESS) if success else style('✗ Failed', Palette.ERROR)
-            print(f"\r{style('[Download]',Palette.INFO)} {code_text(filename)}: {status}")
+        self._interval = max(self.MIN_INTERVAL, min(interval, self.MAX_INTERVAL))
+        # block mode keeps one row per file and redraws the rows in place
+        self._block = block and _ANSI
+        self._rows: Dict[str, bytes] = {}
+        self._drawn_rows = 0
+        self._rows_dirty = False
+        self._width = MenuScreen._terminal_width()
+        sys.stdout.flush()
+        try:
+            self._fd: Optional[int] = sys.stdout.fileno()
+        except (OSError, ValueError):
+            self._fd = None
+        self._slots: List[list] = []
+        self._register_lock = Lock()
+        self._events: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer = Thread(target=self._drain, daemon=True)
+        self._writer.start()
+    def track(self) -> list:
+        # one mutable cell per job, written from whichever thread yt-dlp reports on;
+        # only registration takes the lock
+        slot = [None]
+        with self._register_lock: self._slots.append(slot)
+        return slot
+    def update(self, slot:list, filename:str, percent:str, speed:str):
+        slot[0] = (filename, percent, speed)
+    def complete(self, slot:list, filename:str,success:bool):
+        slot[0] = None
+        self._events.put_nowait((filename, success))
+    def close(self):
+        self._events.put_nowait(self._STOP)
+        self._writer.join()
+    def _drain(self):
+        shown: Dict[int, Tuple[str, str, str]] = {}
+        stop = False
+        while not stop:
+            deadline = time.monotonic() + self._interval
+            while True:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0: break
+                try:
+                    item = self._events.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    stop = True; break
+                self._print_complete(*item)
+            for slot in tuple(self._slots):
+                state = slot[0]
+                if state is not None and shown.get(id(slot)) != state:
+                    shown[id(slot)] = state
+                    self._print_progress(*state)
+            if self._block: self._flush_block()
+    def _emit(self, out: bytes):
+        if self._fd is None: write_frame(out)
+        else: os.write(self._fd, out)
+    # visible columns of a progress row besides the name, percent and speed
+    _ROW_FIXED = len("[Download] ") + len(" Progress: ") + len(" | Speed: ")
+    def _row_name(self, filename: str, fixed: int) -> bytes:
+        # a wrapped row would throw off the ESC[nA move, so every row stays below the width
+        budget = max(1, self._width - 1 - fixed)
+        cols = [2 if unicodedata.east_asian_width(c) in "WF" else 1 for c in filename]
+        if sum(cols) > budget:
+            used = 0
+            for i, w in enumerate(cols):
+                if used + w > budget - 1: break
+                used += w
+            filename = filename[:i] + "…"
+        return self._CODE + filename.encode("utf-8", "replace") + self._RESET
+    def _flush_block(self):
+        if not self._rows_dirty: return
+        out = b"\x1b[%dA" % self._drawn_rows if self._drawn_rows else b""
+        for row in self._rows.values():
+            out += b"\r\x1b[2K" + row + b"\n"
+        self._drawn_rows = len(self._rows)
+        self._rows_dirty = False
+        self._emit(out)
+    def _print_progress(self, filename:str, percent:str, speed:str):
+        if self._block:
+            self._rows[filename] = self._TAG[1:] + self._row_name(filename, self._ROW_FIXED + len(percent) + len(speed)) + b" " + self._PROGRESS[1:] + percent.encode("ascii", "replace") + self._SPEED + speed.encode("ascii", "replace") + self._RESET
+            self._rows_dirty = True; return
+        out = b""
+        if filename != self._current_file:
+            self._current_file = filename
+            out = self._TAG + self._CODE + filename.encode("utf-8", "replace") + self._RESET + b"\n"
+        out += self._PROGRESS + percent.encode("ascii", "replace") + self._SPEED + speed.encode("ascii", "replace") + self._RESET
+        self._emit(out)
+    def _print_complete(self, filename:str, success:bool):
+        status = success_text('✓ Done') if success else error_text('✗ Failed')
+        if self._block:
+            self._rows[filename] = self._TAG[1:] + self._row_name(filename, len("[Download] : ") + visible_len(status)) + b": " + status.encode("utf-8")
+            self._rows_dirty = True; return
+        print(f"\r{info_text('[Download]')} {code_text(filename)}: {status}", flush=True)
 # ============= MENU/CONTROL =============
-def select_format(formats: List[dict]) -> Optional[dict]:
+def select_format(formats: List[VideoFormat], title: str = "Select Format") -> Optional[VideoFormat]:
     if not formats: return None
     selection = 0
-    navigation_hint = style("Use ↑/↓ to navigate, Enter to select, ESC to cancel.", Palette.ACCENT)
+    rendered = []
+    for _, h, ext, size, fps in formats:
+        sz = format_size(size) if size else 'Unknown size'
+        rendered.append(option_pair(f"{h}p", f"{ext} | {sz} | {fps} fps"))
+    lines = [style(title, Palette.HEADER)]
+    lines += [pair[idx==selection] for idx, pair in enumerate(rendered)]
+    lines += ["", _NAV_HINT_CANCEL]
     with MenuScreen() as screen:
+        screen.render(lines)
         while True:
-            lines = [style("Select Format", Palette.HEADER)]
-            for idx, fmt in enumerate(formats):
-                h=fmt['height']; ext=fmt['ext']; sz=format_size(fmt['filesize']) if fmt['filesize'] else 'Unknown size'; fps=fmt['fps']
-                label = f"{h}p"; value = f"{ext} | {sz} | {fps} fps"
-                lines.append(format_menu_option(label, value=value, selected=selection==idx))
-            lines.append(""); lines.append(navigation_hint);screen.render(lines)
             k = read_keypress()
-            if k=="UP": selection = (selection-1)%len(formats)
-            elif k=="DOWN": selection=(selection+1)%len(formats)
+            if k in ("UP", "DOWN"):
+                old = selection
+                selection = (selection + (-1 if k=="UP" else 1)) % len(formats)
+                lines[1+old] = rendered[old][0]
+                lines[1+selection] = rendered[selection][1]
+                screen.render_marker_change(1+old, 1+selection, lines)
             elif k=="ENTER": screen.reset(); return formats[selection]
             elif k=="ESC": screen.reset(); return None
 
+def parse_urls(text: str) -> List[str]:
+    # a URL pasted twice would be fetched and downloaded twice; keep the first spelling
+    urls: Dict[str, str] = {}
+    for u in re.split(r"[\s,]+", text):
+        if u: urls.setdefault(format_cache_key(u), u)
+    return list(urls.values())
+
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_SIZE = 0
+
+def worker_pool(size: int) -> ThreadPoolExecutor:
+    # one long-lived pool, so each worker keeps its thread-local YoutubeDL instances
+    # across batches; it is only rebuilt when ParallelDownloads changes
+    global _POOL, _POOL_SIZE
+    if _POOL is None or size != _POOL_SIZE:
+        if _POOL is not None: _POOL.shutdown(wait=False)
+        _POOL = ThreadPoolExecutor(max_workers=size); _POOL_SIZE = size
+    return _POOL
+
+def run_jobs(pool: ThreadPoolExecutor, fn, calls: List[tuple]) -> list:
+    # a single call runs inline on the main thread, which lives as long as the process
+    if len(calls) < 2: return [fn(*args) for args in calls]
+    futs = [pool.submit(fn, *args) for args in calls]
+    return [fut.result() for fut in futs]
+
+def run_with_spinner(message: str, futures: List[Future]) -> Optional[list]:
+    # returns None when the user presses ESC; fetches not yet started are cancelled,
+    # those already running finish in the background
+    if not _ANSI:
+        print(info_text(message)); return [fut.result() for fut in futures]
+    frames = itertools.cycle("|/-\\")
+    cancellable = supports_keyboard_navigation()
+    hint = f" {warning_text('(ESC to cancel)')}" if cancellable else ""
+    try:
+        while not all(fut.done() for fut in futures):
+            sys.stdout.write(f"\r{accent(next(frames))} {info_text(message)}{hint}"); sys.stdout.flush()
+            if not cancellable: wait(futures, 0.1)
+            elif read_keypress(0.1) == "ESC":
+                for fut in futures: fut.cancel()
+                sys.stdout.write("\r\x1b[2K"); sys.stdout.flush(); return None
+    finally:
+        leave_key_mode()
+    sys.stdout.write(f"\r\x1b[2K{info_text(message)}\n"); sys.stdout.flush()
+    return [fut.result() for fut in futures]
+
 def handle_download(settings: RuntimeSettings):
     clear_console(); pop_hidden_cursor(force=True)
-    lines = status_panel(settings)
-    if lines: print("\n".join(lines))
+    print_status_panel(settings)
     header("Download Video")
-    url = input(prompt("Enter video URL")).strip()
-    if not url:
+    urls = parse_urls(input(prompt("Enter video URL(s), separated by spaces or commas")))
+    if not urls:
         print(warning_text("No URL provided")); input(prompt("Press Enter to continue")); return
-    print(info_text("Fetching formats..."))
-    info, formats, error = fetch_formats(url)
-    if error:
-        print(error_text(f"Error: {error}")); input(prompt("Press Enter to continue")); return
-    if not formats:
-        print(warning_text("No combined video+audio formats found")); input(prompt("Press Enter to continue")); return
-    formats.sort(key=lambda x:x['height'],reverse=True)
-    selected = select_format(formats)
-    if not selected:
-        print(info_text("Download cancelled")); input(prompt("Press Enter to continue")); return
-    clear_console(); lines = status_panel(settings)
-    if lines: print("\n".join(lines))
+    pool = worker_pool(settings.ParallelDownloads)
+    results = run_with_spinner("Fetching formats...", [pool.submit(fetch_formats, u) for u in urls])
+    if results is None:
+        print(warning_text("Fetching cancelled")); input(prompt("Press Enter to continue")); return
+    fetched = dict(zip(urls, results))
+    jobs: List[Tuple[str, dict, VideoFormat]] = []
+    problems: List[str] = []
+    for url in urls:
+        info, formats, error = fetched[url]
+        tag = f" ({url})" if len(urls) > 1 else ""
+        if error:
+            problems.append(error_text(f"Error{tag}: {error}")); continue
+        if not formats:
+            problems.append(warning_text(f"No combined video+audio formats found{tag}")); continue
+        formats.sort(key=attrgetter('height'),reverse=True)
+        title = "Select Format" if len(urls) == 1 else f"Select Format: {info.get('title', url)}"
+        selected = select_format(formats, title)
+        if not selected:
+            problems.append(info_text(f"Download cancelled{tag}")); continue
+        jobs.append((url, info, selected))
+    if not jobs:
+        print("\n".join(problems)); input(prompt("Press Enter to continue")); return
+    clear_console(); print_status_panel(settings)
     header("Download Summary")
-    print(f" Title: {value_text(info.get('title','Unknown'))}\n Quality: {value_text(str(selected['height'])+'p')}\n Format: {value_text(selected['ext'])}\n Size: {value_text(format_size(selected['filesize']) if selected['filesize'] else 'Unknown')}\n Destination: {info_text(str(settings.OutputFolder))}")
+    for url, info, selected in jobs:
+        print(f" Title: {value_text(info.get('title','Unknown'))}\n Quality: {value_text(str(selected.height)+'p')}\n Format: {value_text(selected.ext)}\n Size: {value_text(format_size(selected.filesize) if selected.filesize else 'Unknown')}")
+    print(f" Destination: {info_text(str(settings.OutputFolder))}")
+    if problems: print("\n".join(problems))
     if input(prompt("Start download? (y/n)")).strip().lower() != 'y':
         print(warning_text("Download cancelled")); input(prompt("Press Enter to continue")); return
     settings.OutputFolder.mkdir(parents=True, exist_ok=True)
     print(info_text("Starting download..."))
-    progress = ProgressDisplay()
-    result_errs = []
-    with ThreadPoolExecutor(max_workers=settings.ParallelDownloads) as pool:
-        futs = [ pool.submit(download_job, url, selected['format_id'], settings.OutputFolder, progress, settings.RetryAttempts) ]
-        for fut in as_completed(futs):
-            success, err = fut.result()
-            if not success: result_errs.append(err)
+    progress = ProgressDisplay(block=len(jobs) > 1)
+    calls = [(url, selected.format_id, settings.OutputFolder, progress, settings.RetryAttempts, settings.ChunkSizeKiB, settings.ConcurrentFragments) for url, _, selected in jobs]
+    result_errs = [err for success, err in run_jobs(pool, download_job, calls) if not success]
+    progress.close()
     print(success_text("Download completed!" if not result_errs else "Some downloads failed"))
     if result_errs:
         for e in result_errs:
@@ -375,30 +832,33 @@ def handle_download(settings: RuntimeSettings):
     input(prompt("Press Enter to continue"))
 
 def configure_settings(settings: RuntimeSettings):
-    selection = 0
-    def build_options() -> list[dict]:
+    selection = 0; drawn = None
+    def build_options() -> List[MenuOption]:
         return [
-            {"label": "Output folder", "value": str(settings.OutputFolder), "action": "output"},
-            {"label": "Overwrite", "value": "ON" if settings.OverwriteExisting else "OFF", "action": "overwrite"},
-            {"label": "Parallel dl", "value": str(settings.ParallelDownloads), "action": "parallel"},
-            {"label": "Retries", "value": str(settings.RetryAttempts), "action": "retries"},
-            {"label": "Chunk KiB", "value": str(settings.ChunkSizeKiB), "action": "chunk"},
-            {"label": "Status panel", "value": "ON" if settings.ShowStatusPanel else "OFF", "action": "status"},
-            {"label": "Back", "hint": "main menu", "action": "back"},
+            MenuOption("Output folder", str(settings.OutputFolder), action="output"),
+            MenuOption("Overwrite", "ON" if settings.OverwriteExisting else "OFF", action="overwrite"),
+            MenuOption("Parallel dl", str(settings.ParallelDownloads), action="parallel"),
+            MenuOption("Retries", str(settings.RetryAttempts), action="retries"),
+            MenuOption("Chunk KiB", str(settings.ChunkSizeKiB), action="chunk"),
+            MenuOption("Fragments", str(settings.ConcurrentFragments), action="fragments"),
+            MenuOption("Status panel", "ON" if settings.ShowStatusPanel else "OFF", action="status"),
+            MenuOption("Back", hint="main menu", action="back"),
         ]
-    navigation_hint = style("Use ↑/↓ to navigate, Enter to select.", Palette.ACCENT)
+    title_line = style("Settings", Palette.HEADER)
+    opts = build_options(); rendered = [option_pair(o.label, o.value, o.hint) for o in opts]
     with MenuScreen() as screen:
         while True:
-            opts = build_options()
             selection = min(selection, len(opts)-1)
-            lines = status_panel(settings) + [style("Settings",Palette.HEADER)]
-            for idx, o in enumerate(opts):
-                lines.append(format_menu_option(o['label'], value=o.get('value',''), hint=o.get('hint',''), selected=selection==idx))
-            lines.append(""); lines.append(navigation_hint); screen.render(lines); k=read_keypress()
+            lines = status_panel(settings) + [title_line]; top = len(lines)
+            lines += [pair[idx==selection] for idx, pair in enumerate(rendered)]
+            lines.append(""); lines.append(_NAV_HINT)
+            if drawn is None or drawn == selection: screen.render(lines)
+            else: screen.render_marker_change(top+drawn, top+selection, lines)
+            drawn = selection; k=read_keypress()
             if k=="UP": selection = (selection - 1) % len(opts)
             elif k=="DOWN": selection = (selection + 1) % len(opts)
             elif k=="ENTER":
-                c=opts[selection]['action']; screen.reset(); clear_console(); pop_hidden_cursor(force=True)
+                c=opts[selection].action; screen.reset(); clear_console(); pop_hidden_cursor(force=True)
                 if c=="output":
                     p=input(prompt("New output folder")).strip();
                     if p: settings.OutputFolder=Path(p); settings.refresh_paths(); settings.save(); print(success_text("Output folder updated"))
@@ -418,34 +878,39 @@ def configure_settings(settings: RuntimeSettings):
                     v=input(prompt("Chunk size in KiB (64-4096)")).strip();
                     if v.isdigit():settings.ChunkSizeKiB=max(64,min(4096,int(v)));settings.save(); print(success_text("Chunk size updated"))
                     else: print(warning_text("Invalid number")); input(prompt("Press Enter to continue"))
+                elif c=="fragments":
+                    v=input(prompt("Concurrent fragments (1-16)")).strip();
+                    if v.isdigit():settings.ConcurrentFragments=max(1,min(16,int(v)));settings.save(); print(success_text(f"Fragments set to {settings.ConcurrentFragments}"))
+                    else: print(warning_text("Invalid number")); input(prompt("Press Enter to continue"))
                 elif c=="status":
                     settings.ShowStatusPanel = not settings.ShowStatusPanel; settings.save(); print(success_text("Status panel toggled")); input(prompt("Press Enter to continue"))
                 elif c=="back": break
-                screen.reset()
+                opts = build_options(); rendered = [option_pair(o.label, o.value, o.hint) for o in opts]; screen.reset()
 def main():
     settings = RuntimeSettings.load()
     if not supports_keyboard_navigation():
         print(error_text("Keyboard navigation required. Run in interactive terminal.")); return
-    selection = 0
-    def build_options() -> list[dict]:
-        return [
-            {"label": "Download video", "action": "download"},
-            {"label": "Settings", "action": "settings"},
-            {"label": "Exit", "action": "exit"},
-        ]
-    navigation_hint = style("Use ↑/↓ to navigate, Enter to select.", Palette.ACCENT)
+    preload_yt_dlp()
+    selection = 0; drawn = None
+    opts = [
+        MenuOption("Download video", action="download"),
+        MenuOption("Settings", action="settings"),
+        MenuOption("Exit", action="exit"),
+    ]
+    rendered = [option_pair(o.label) for o in opts]
+    title_lines = [style("YT-DLP Video Downloader", _HEADER_BOLD), "", style("Menu", Palette.HEADER)]
     with MenuScreen() as screen:
         while True:
-            opts = build_options()
-            selection = min(selection, len(opts)-1)
-            lines = status_panel(settings) + [style("YT-DLP Video Downloader", Palette.HEADER+Palette.BOLD), "", style("Menu", Palette.HEADER)]
-            for idx, o in enumerate(opts):
-                lines.append(format_menu_option(o['label'], selected=selection==idx))
-            lines.append(""); lines.append(navigation_hint); screen.render(lines); k=read_keypress()
+            lines = status_panel(settings) + title_lines; top = len(lines)
+            lines += [pair[idx==selection] for idx, pair in enumerate(rendered)]
+            lines.append(""); lines.append(_NAV_HINT)
+            if drawn is None or drawn == selection: screen.render(lines)
+            else: screen.render_marker_change(top+drawn, top+selection, lines)
+            drawn = selection; k=read_keypress()
             if k=="UP": selection = (selection - 1) % len(opts)
             elif k=="DOWN": selection = (selection + 1) % len(opts)
             elif k=="ENTER":
-                c=opts[selection]['action']; screen.reset(); clear_console();
+                c=opts[selection].action; screen.reset(); clear_console();
                 if c=="download": handle_download(settings)
                 elif c=="settings": configure_settings(settings)
                 elif c=="exit": print(success_text("Goodbye!")); break
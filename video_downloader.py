@@ -3,12 +3,14 @@ from tkinter import ttk, messagebox, filedialog
 import yt_dlp
 import threading
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 class VideoDownloaderGUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Video Downloader")
-        self.root.geometry("700x500")
+        self.root.geometry("700x620")
         self.root.resizable(False, False)
         
         # Variables
@@ -16,6 +18,30 @@ class VideoDownloaderGUI:
         self.download_path = tk.StringVar(value=os.path.expanduser("~/Downloads"))
         self.formats = []
         self.selected_format = tk.StringVar()
+        self.parallel_var = tk.IntVar(value=2)
+        self._fetched_title = "Video"
+        
+        # Download queue: one listbox row per job, run on a pool sized by parallel_var
+        self._executor = None
+        self._executor_workers = 0
+        self._futures = {}
+        self._queue_labels = []
+        self._jobs_active = 0
+        self._jobs_failed = 0
+        self._job_tls = threading.local()
+        
+        # Latest progress per queue row, flushed to Tk by a single pending callback
+        self._pending_progress = {}
+        self._row_percent = {}
+        self._progress_lock = threading.Lock()
+        self._progress_scheduled = False
+        
+        # One YoutubeDL session shared by fetch and download, plus the last fetched info
+        self._ydl = None
+        self._ydl_lock = threading.Lock()
+        # (url, info), replaced as one object so a job never pairs a URL with another's info
+        self._last_fetch = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Create GUI elements
         self.create_widgets()
@@ -36,8 +62,10 @@ class VideoDownloaderGUI:
         path_frame = ttk.LabelFrame(self.root, text="Download Location", padding=10)
         path_frame.pack(fill="x", padx=10, pady=10)
         
-        ttk.Entry(path_frame, textvariable=self.download_path, width=60).pack(side="left", padx=5)
+        ttk.Entry(path_frame, textvariable=self.download_path, width=50).pack(side="left", padx=5)
         ttk.Button(path_frame, text="Browse", command=self.browse_folder).pack(side="left", padx=5)
+        ttk.Label(path_frame, text="Parallel:").pack(side="left", padx=5)
+        ttk.Spinbox(path_frame, from_=1, to=8, textvariable=self.parallel_var, width=3).pack(side="left")
         
         # Format Selection Frame
         format_frame = ttk.LabelFrame(self.root, text="Available Formats", padding=10)
@@ -47,10 +75,17 @@ class VideoDownloaderGUI:
         scrollbar = ttk.Scrollbar(format_frame)
         scrollbar.pack(side="right", fill="y")
         
-        self.format_listbox = tk.Listbox(format_frame, yscrollcommand=scrollbar.set, height=10)
+        self.format_listbox = tk.Listbox(format_frame, yscrollcommand=scrollbar.set, height=8)
         self.format_listbox.pack(fill="both", expand=True)
         scrollbar.config(command=self.format_listbox.yview)
         
+        # Download Queue Frame
+        queue_frame = ttk.LabelFrame(self.root, text="Download Queue", padding=10)
+        queue_frame.pack(fill="x", padx=10)
+        
+        self.queue_listbox = tk.Listbox(queue_frame, height=5)
+        self.queue_listbox.pack(fill="x")
+        
         # Progress Frame
         progress_frame = ttk.Frame(self.root, padding=10)
         progress_frame.pack(fill="x", padx=10, pady=10)
@@ -58,7 +93,7 @@ class VideoDownloaderGUI:
         self.progress_label = ttk.Label(progress_frame, text="Ready")
         self.progress_label.pack()
         
-        self.progress_bar = ttk.Progressbar(progress_frame, mode="indeterminate")
+        self.progress_bar = ttk.Progressbar(progress_frame, mode="determinate", maximum=100)
         self.progress_bar.pack(fill="x", pady=5)
         
         # Download Button
@@ -78,21 +113,67 @@ class VideoDownloaderGUI:
             return
         
         self.progress_label.config(text="Fetching available formats...")
-        self.progress_bar.start()
+        # No percentage is known while extracting, so animate only for this phase
+        # (unless queued downloads are already driving the bar)
+        if not self._jobs_active:
+            self.progress_bar.config(mode="indeterminate")
+            self.progress_bar.start()
         self.format_listbox.delete(0, tk.END)
         
         thread = threading.Thread(target=self._fetch_formats_thread, args=(url,))
         thread.start()
     
+    def _new_ydl(self):
+        return yt_dlp.YoutubeDL({
+            'quiet': True,
+            'no_warnings': True,
+            'progress_hooks': [self.progress_hook],
+        })
+    
+    @contextmanager
+    def _session(self):
+        # YoutubeDL is not thread-safe: borrow the shared one if it is free, else use a private one
+        if not self._ydl_lock.acquire(blocking=False):
+            with self._new_ydl() as ydl:
+                yield ydl
+            return
+        try:
+            if self._ydl is None:
+                self._ydl = self._new_ydl()
+            yield self._ydl
+        finally:
+            self._ydl_lock.release()
+    
+    @staticmethod
+    def _set_format(ydl, format_id):
+        # The selector is compiled from params['format'] only at construction time;
+        # None restores yt-dlp's per-video default
+        ydl.params['format'] = format_id
+        ydl.format_selector = ydl.build_format_selector(format_id) if format_id else None
+    
+    def on_close(self):
+        # shutdown() alone would still run every queued job, with no window left to show it
+        for future, _ in self._futures.values():
+            future.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        # A running download holds the session; it is then left to finish before exit
+        if self._ydl_lock.acquire(blocking=False):
+            try:
+                if self._ydl is not None:
+                    self._ydl.__exit__(None, None, None)
+                    self._ydl = None
+            finally:
+                self._ydl_lock.release()
+        self.root.destroy()
+    
     def _fetch_formats_thread(self, url):
         try:
-            ydl_opts = {
-                'quiet': True,
-                'no_warnings': True,
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            with self._session() as ydl:
+                # A previous download left its format id on the shared session
+                self._set_format(ydl, None)
                 info = ydl.extract_info(url, download=False)
+                self._last_fetch = (url, info)
                 
                 # Extract and organize formats
                 self.formats = []
@@ -118,8 +199,15 @@ class VideoDownloaderGUI:
         except Exception as e:
             self.root.after(0, self._show_error, f"Error fetching formats: {str(e)}")
     
-    def _update_format_list(self, format_list, title):
+    def _stop_busy(self):
         self.progress_bar.stop()
+        self.progress_bar.config(mode="determinate")
+        if not self._jobs_active:
+            self.progress_bar.config(value=0)
+    
+    def _update_format_list(self, format_list, title):
+        self._stop_busy()
+        self._fetched_title = title
         
         if not format_list:
             self.progress_label.config(text="No formats available")
@@ -133,7 +221,7 @@ class VideoDownloaderGUI:
         self.download_btn.config(state="normal")
     
     def _show_error(self, message):
-        self.progress_bar.stop()
+        self._stop_busy()
         self.progress_label.config(text="Error occurred")
         messagebox.showerror("Error", message)
     
@@ -147,44 +235,150 @@ class VideoDownloaderGUI:
         url = self.url_var.get().strip()
         download_path = self.download_path.get()
         
-        self.progress_label.config(text="Downloading...")
-        self.progress_bar.start()
-        self.download_btn.config(state="disabled")
+        # Queue the job; the button stays enabled so more formats/URLs can be added
+        row = len(self._queue_labels)
+        self._queue_labels.append(f"{self._fetched_title[:40]} | {self.format_listbox.get(selection[0])}")
+        self.queue_listbox.insert(tk.END, f"{self._queue_labels[row]} - Queued")
+        if not self._jobs_active:
+            self.progress_bar.config(value=0)
+        self._jobs_active += 1
         
-        thread = threading.Thread(target=self._download_thread, args=(url, format_id, download_path))
-        thread.start()
+        self._submit(row, (url, format_id, download_path))
+        self._show_overall()
+    
+    def _submit(self, row, args):
+        future = self._get_executor().submit(self._download_job, row, *args)
+        self._futures[row] = (future, args)
+        future.add_done_callback(lambda f: self.root.after(0, self._job_done, row, f))
     
-    def _download_thread(self, url, format_id, download_path):
+    def _get_executor(self):
         try:
-            ydl_opts = {
-                'format': format_id,
-                'outtmpl': os.path.join(download_path, '%(title)s.%(ext)s'),
-                'progress_hooks': [self.progress_hook],
-            }
-            
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
-            
-            self.root.after(0, self._download_complete)
-            
-        except Exception as e:
-            self.root.after(0, self._show_error, f"Download error: {str(e)}")
-            self.root.after(0, lambda: self.download_btn.config(state="normal"))
+            workers = max(1, min(8, self.parallel_var.get()))
+        except tk.TclError:
+            workers = 1
+        if self._executor is None or workers != self._executor_workers:
+            old = self._executor
+            self._executor = ThreadPoolExecutor(max_workers=workers)
+            self._executor_workers = workers
+            if old is not None:
+                # Move jobs that have not started to the new pool, so the old one only
+                # finishes its running downloads and the total stays near the new limit
+                for row, (future, args) in list(self._futures.items()):
+                    if future.cancel():
+                        self._submit(row, args)
+                old.shutdown(wait=False)
+        return self._executor
+    
+    def _download_job(self, row, url, format_id, download_path):
+        # Runs on a pool thread; progress_hook finds its queue row through the thread-local
+        self._job_tls.row = row
+        try:
+            with self._session() as ydl:
+                self._set_format(ydl, format_id)
+                ydl.params['outtmpl']['default'] = os.path.join(download_path, '%(title)s.%(ext)s')
+                
+                # Reuse the fetched info so the extractor does not run a second time;
+                # like yt-dlp's --load-info-json, fall back to the URL if it went stale.
+                # The fetch already applied the default format choice (requested_formats
+                # etc.); sanitize_info drops it and returns a fresh copy for this job
+                last_url, info = self._last_fetch or (None, None)
+                if last_url != url:
+                    info = None
+                if info is None:
+                    ydl.download([url])
+                else:
+                    try:
+                        ydl.process_ie_result(ydl.sanitize_info(info, remove_private_keys=True), download=True)
+                    except (yt_dlp.utils.DownloadError, yt_dlp.utils.ReExtractInfo):
+                        ydl.download([url])
+        finally:
+            self._job_tls.row = None
+    
+    def _job_done(self, row, future):
+        # A cancelled future was either moved to a new pool or dropped on close
+        if future.cancelled():
+            return
+        del self._futures[row]
+        with self._progress_lock:
+            self._pending_progress.pop(row, None)
+        self._row_percent.pop(row, None)
+        self._jobs_active -= 1
+        error = future.exception()
+        if error is not None:
+            self._jobs_failed += 1
+            self._set_queue_row(row, "Failed")
+            self._show_error(f"Download error: {str(error)}")
+        else:
+            self._set_queue_row(row, "Done")
+        
+        if self._jobs_active:
+            self._show_overall()
+        elif self._jobs_failed:
+            self._jobs_failed = 0
+            self.progress_label.config(text="Downloads finished with errors")
+        else:
+            self._download_complete()
+    
+    def _set_queue_row(self, row, status):
+        self.queue_listbox.delete(row)
+        self.queue_listbox.insert(row, f"{self._queue_labels[row]} - {status}")
     
     def progress_hook(self, d):
+        row = getattr(self._job_tls, 'row', None)
+        if row is None:
+            return
         if d['status'] == 'downloading':
             percent = d.get('_percent_str', 'N/A')
             speed = d.get('_speed_str', 'N/A')
-            self.root.after(0, lambda: self.progress_label.config(
-                text=f"Downloading: {percent} | Speed: {speed}"))
+            self._post_progress(row, f"Downloading: {percent} | Speed: {speed}", self._percent_value(d))
         elif d['status'] == 'finished':
-            self.root.after(0, lambda: self.progress_label.config(text="Processing..."))
+            self._post_progress(row, "Processing...", None)
+    
+    def _post_progress(self, row, text, value):
+        # Hooks fire many times a second; only the latest state is shown, at most every 50 ms
+        with self._progress_lock:
+            self._pending_progress[row] = (text, value)
+            if self._progress_scheduled:
+                return
+            self._progress_scheduled = True
+        self.root.after(50, self._flush_progress)
+    
+    def _flush_progress(self):
+        with self._progress_lock:
+            pending, self._pending_progress = self._pending_progress, {}
+            self._progress_scheduled = False
+        for row, (text, value) in pending.items():
+            self._set_queue_row(row, text)
+            if value is not None:
+                self._row_percent[row] = value
+        if pending:
+            self._show_overall()
+    
+    @staticmethod
+    def _percent_value(d):
+        # Prefer the byte counters; the percent string is only a fallback
+        total = d.get('total_bytes') or d.get('total_bytes_estimate')
+        if total:
+            return min(100.0, d.get('downloaded_bytes', 0) * 100.0 / total)
+        try:
+            return float(d.get('_percent_str', '').strip().rstrip('%'))
+        except ValueError:
+            return None
+    
+    def _show_overall(self):
+        # The shared bar and label summarise the queue (jobs not started count as 0%);
+        # per-file percent and speed are shown in the queue rows
+        rows = list(self._futures)
+        if not rows:
+            return
+        percent = sum(self._row_percent.get(row, 0.0) for row in rows) / len(rows)
+        self.progress_bar.config(value=percent)
+        self.progress_label.config(text=f"Downloading... ({len(rows)} active) | {percent:.0f}%")
     
     def _download_complete(self):
-        self.progress_bar.stop()
+        self.progress_bar.config(value=100)
         self.progress_label.config(text="Download completed!")
-        self.download_btn.config(state="normal")
-        messagebox.showinfo("Success", "Video downloaded successfully!")
+        messagebox.showinfo("Success", "All queued downloads completed successfully!")
 
 def main():
     root = tk.Tk()